@@ -2,7 +2,7 @@
 # License: GNU AGPLv3
 
 from collections import defaultdict
-from itertools import combinations, filterfalse
+from itertools import chain
 
 import numpy as np
 from igraph import Graph
@@ -14,16 +14,14 @@ def _limit_mapping(mapping):
     :math:`f : \\{0, \\ldots, n - 1\\}} \to \\{0, \\ldots, n - 1\\}}`, such
     that :math:`f^{(k)} = f^{(k + 1)}` for some :math:`k`, find the 1D array
     corresponding to :math:`f^{(k)}`."""
-    terminal_states = np.empty_like(mapping)
-    for i, initial_target_idx in enumerate(mapping):
-        temp_target_idx = i
-        next_target_idx = initial_target_idx
-        while temp_target_idx != next_target_idx:
-            temp_target_idx = mapping[temp_target_idx]
-            next_target_idx = mapping[mapping[temp_target_idx]]
-        terminal_states[i] = temp_target_idx
-
-    return terminal_states
+    # Pointer jumping: replacing f with f o f compresses all paths at once and
+    # reaches the limit after O(log(k)) vectorized steps.
+    terminal_states = mapping
+    while True:
+        next_terminal_states = terminal_states[terminal_states]
+        if np.array_equal(next_terminal_states, terminal_states):
+            return terminal_states
+        terminal_states = next_terminal_states
 
 
 class Nerve(BaseEstimator, TransformerMixin):
@@ -127,40 +125,54 @@ class Nerve(BaseEstimator, TransformerMixin):
         for i, sample in enumerate(X):
             for node_id_pair in sample:
                 labels_to_indices[node_id_pair].append(i)
-        labels_to_indices = {key: np.array(value)
-                             for key, value in labels_to_indices.items()}
         n_nodes = len(labels_to_indices)
         graph = Graph(n_nodes)
 
+        # Node elements of all nodes are stored contiguously in a single
+        # array, with the elements of node i between offsets[i] and
+        # offsets[i + 1]. Samples are visited in order, so the elements of
+        # each node are sorted and unique. `_generate_edge_data` relies on
+        # this.
+        node_sizes = np.fromiter(map(len, labels_to_indices.values()),
+                                 dtype=np.int64, count=n_nodes)
+        offsets = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(node_sizes, out=offsets[1:])
+        node_elements_flat = np.fromiter(
+            chain.from_iterable(labels_to_indices.values()), dtype=np.int64,
+            count=offsets[-1]
+            )
+
         # labels_to_indices is a dictionary of, say, N key-value pairs of the
         # form (pullback_set_label, partial_cluster_label): node_elements.
         # Hence, zip(*labels_to_indices) generates two tuples of length N, each
         # corresponding to a type of node attribute in the final graph.
         node_attributes = zip(*labels_to_indices)
-        graph.vs["pullback_set_label"] = next(node_attributes)
+        pullback_set_labels = next(node_attributes)
+        node_elements = np.split(node_elements_flat, offsets[1:-1])
+        graph.vs["pullback_set_label"] = pullback_set_labels
         graph.vs["partial_cluster_label"] = next(node_attributes)
-        graph.vs["node_elements"] = [*labels_to_indices.values()]
+        graph.vs["node_elements"] = node_elements
 
         # Graph construction -- edges with weights given by intersection sizes.
-        # In general, we need all information in `nodes` to narrow down the set
-        # of combinations to check, especially when `contract_nodes` is True.
-        nodes = zip(*zip(*labels_to_indices), labels_to_indices.values())
+        # Pullback set labels are needed to skip pairs of nodes from the same
+        # pullback set.
         node_index_pairs, weights, intersections, mapping = \
-            self._generate_edge_data(nodes, n_nodes)
+            self._generate_edge_data(node_elements_flat, node_sizes,
+                                     pullback_set_labels)
         graph.es["weight"] = 1
         graph.add_edges(node_index_pairs)
         graph.es["weight"] = weights
         if self.store_edge_elements:
             graph.es["edge_elements"] = intersections
         if self.contract_nodes:
-            # Due to the order in which itertools.combinations produces pairs,
-            # and to the preference given to node 1 in the if-elif-else clause
-            # in `_subset_check_metadata_append`, `mapping` is guaranteed to
-            # send everything to one of its fixed points after sufficiently
-            # many repeated applications and, by construction, no two pairs of
-            # indices in `_limit_mapping(mapping)` can correspond to data
-            # subsets which are in a subset relation. Thus the nodes are
-            # correctly contracted by `_limit_mapping(mapping)`.
+            # Due to the lexicographic order in which candidate pairs are
+            # visited in `_generate_edge_data`, and to the preference given to
+            # node 1 there when two nodes have the same elements, `mapping` is
+            # guaranteed to send everything to one of its fixed points after
+            # sufficiently many repeated applications and, by construction, no
+            # two pairs of indices in `_limit_mapping(mapping)` can correspond
+            # to data subsets which are in a subset relation. Thus the nodes
+            # are correctly contracted by `_limit_mapping(mapping)`.
             limit_mapping = _limit_mapping(mapping)
             graph.contract_vertices(limit_mapping,
                                     combine_attrs="first")
@@ -169,76 +181,119 @@ class Nerve(BaseEstimator, TransformerMixin):
 
         return graph
 
-    def _generate_edge_data(self, nodes, n_nodes):
-        def _in_same_pullback_set(_node_tuple):
-            return _node_tuple[0][1][0] == _node_tuple[1][1][0]
-
-        def _do_nothing(*args):
-            pass
-
-        def _intersections_append(_intersection):
-            return intersections.append(_intersection)
-
-        def _metadata_append(
-                _node_1_idx, _node_2_idx, _intersection_size, _intersection,
-                *args
-                ):
-            if _intersection_size >= self.min_intersection:
-                # Add edge (as a node tuple) to list of node index pairs
-                node_index_pairs.append((_node_1_idx, _node_2_idx))
-                weights.append(_intersection_size)
-                intersection_behavior(_intersection)
-
-        def _subset_check_metadata_append(
-                _node_1_idx, _node_2_idx, _intersection_size, _intersection,
-                _node_1_elements, _node_2_elements
-                ):
-            if _intersection_size == len(_node_2_elements):
-                # Node 2 is contained in node 1 and we remove it in favour of
-                # node 1.
-                mapping[_node_2_idx] = _node_1_idx
-            elif _intersection_size == len(_node_1_elements):
-                # Node 1 is strictly contained in node 2 and we remove it in
-                # favour of node 2.
-                mapping[_node_1_idx] = _node_2_idx
-            else:
-                # Edge exists provided `_intersection_size` is large enough
-                _metadata_append(_node_1_idx, _node_2_idx, _intersection_size,
-                                 _intersection)
-
-        node_tuples = combinations(enumerate(nodes), 2)
-
-        node_index_pairs = []
-        weights = []
-        intersections = []
+    def _generate_edge_data(self, node_elements_flat, node_sizes,
+                            pullback_set_labels):
+        n_nodes = len(node_sizes)
+        mapping = np.arange(n_nodes) if self.contract_nodes else None
+        if not n_nodes:
+            return [], [], [], mapping
+
+        # Invert the cover: lay out (node index, data index) pairs as two flat
+        # arrays, stably sorted by data index. Each data point then gives a
+        # contiguous run of the (increasing) indices of the nodes containing
+        # it, and only pairs of nodes co-occurring in some run can intersect.
+        # Since the elements of each node are sorted, the stable sort below
+        # only has to merge presorted runs.
+        node_col = np.repeat(np.arange(n_nodes), node_sizes)
+        point_col = node_elements_flat
+        if not self.contract_nodes and self.min_intersection > 1:
+            # Nodes with fewer elements than `min_intersection` cannot be the
+            # endpoints of any edge, so they need not be paired at all
+            is_large_enough = node_sizes[node_col] >= self.min_intersection
+            node_col = node_col[is_large_enough]
+            point_col = point_col[is_large_enough]
+        order = np.argsort(point_col, kind="stable")
+        node_col = node_col[order]
+        point_col = point_col[order]
+
+        # Entries `offset` positions apart in the same run give pairs of nodes
+        # sharing a data point. Runs are as long as the maximum number of
+        # nodes containing a single point, which is small for Mapper covers.
+        # As runs are contiguous, a position can only start a pair at a given
+        # offset if it started one at the previous offset, so all other
+        # positions are pruned as the offset grows.
+        node_1_col, node_2_col, shared_col = [], [], []
+        n_entries = len(point_col)
+        starts = np.arange(n_entries - 1)
+        offset = 1
+        while len(starts):
+            starts = starts[point_col[starts + offset] == point_col[starts]]
+            if not len(starts):
+                break
+            node_1_col.append(node_col[starts])
+            node_2_col.append(node_col[starts + offset])
+            shared_col.append(point_col[starts])
+            offset += 1
+            starts = starts[starts < n_entries - offset]
+
+        if not node_1_col:
+            return [], [], [], mapping
+
+        node_1_col = np.concatenate(node_1_col)
+        node_2_col = np.concatenate(node_2_col)
+        shared_col = np.concatenate(shared_col)
 
-        # Choose whether intersections are stored or not.
-        # `intersection_behavior` is in scope for `_metadata_append` and
-        # `_subset_check_metadata_append`.
-        if self.store_edge_elements:
-            intersection_behavior = _intersections_append
+        # No need to check for intersections within each pullback set as the
+        # input is assumed to be a refined Mapper cover
+        pullback_set_labels = np.asarray(pullback_set_labels)
+        different_pullback_set = \
+            pullback_set_labels[node_1_col] != pullback_set_labels[node_2_col]
+        node_1_col = node_1_col[different_pullback_set]
+        node_2_col = node_2_col[different_pullback_set]
+        shared_col = shared_col[different_pullback_set]
+
+        # Aggregate intersection sizes per pair of nodes. Pairs are encoded as
+        # single integers so that aggregating in increasing order of codes
+        # gives the same lexicographic order as ``itertools.combinations``.
+        # For dense covers, a table of counts indexed by all possible codes is
+        # not larger than the list of codes and avoids sorting it.
+        pair_codes = node_1_col * n_nodes + node_2_col
+        if n_nodes * n_nodes <= len(pair_codes):
+            intersection_sizes = np.bincount(pair_codes,
+                                             minlength=n_nodes * n_nodes)
+            unique_codes = np.flatnonzero(intersection_sizes)
+            intersection_sizes = intersection_sizes[unique_codes]
         else:
-            intersection_behavior = _do_nothing
+            unique_codes, intersection_sizes = np.unique(pair_codes,
+                                                         return_counts=True)
+        node_index_pairs = np.column_stack(np.divmod(unique_codes, n_nodes))
 
+        # Edge exists provided the intersection size is large enough
+        is_edge = intersection_sizes >= self.min_intersection
         if self.contract_nodes:
-            mapping = np.arange(n_nodes)
-            behavior = _subset_check_metadata_append
-        else:
-            mapping = None
-            behavior = _metadata_append
+            # Sizes of both nodes in each pair are gathered at once to detect
+            # subset relations. Only pairs in such a relation, visited in
+            # order, update `mapping`, and they do not give edges.
+            is_node_2_in_node_1 = \
+                intersection_sizes == node_sizes[node_index_pairs[:, 1]]
+            is_subset = is_node_2_in_node_1 | \
+                (intersection_sizes == node_sizes[node_index_pairs[:, 0]])
+            for (node_1_idx, node_2_idx), node_2_in_node_1 in zip(
+                    node_index_pairs[is_subset].tolist(),
+                    is_node_2_in_node_1[is_subset].tolist()
+                    ):
+                if node_2_in_node_1:
+                    # Node 2 is contained in node 1 and we remove it in favour
+                    # of node 1.
+                    mapping[node_2_idx] = node_1_idx
+                else:
+                    # Node 1 is strictly contained in node 2 and we remove it
+                    # in favour of node 2.
+                    mapping[node_1_idx] = node_2_idx
+            is_edge &= ~is_subset
 
-        # No need to check for intersections within each pullback set as the
-        # input is assumed to be a refined Mapper cover
-        for node_tuple in filterfalse(_in_same_pullback_set, node_tuples):
-            ((node_1_idx, (_, _, node_1_elements)),
-             (node_2_idx, (_, _, node_2_elements))) = node_tuple
-            intersection = np.intersect1d(node_1_elements, node_2_elements)
-            intersection_size = len(intersection)
-
-            if intersection_size:
-                behavior(node_1_idx, node_2_idx, intersection_size,
-                         intersection, node_1_elements, node_2_elements)
-            else:
-                continue
-
-        return node_index_pairs, weights, intersections, mapping
+        intersections = []
+        if self.store_edge_elements:
+            # Group shared data indices by pair, in increasing order within
+            # each group as with ``np.intersect1d``
+            shared_col = shared_col[np.lexsort((shared_col, pair_codes))]
+            intersections = np.split(shared_col,
+                                     np.cumsum(intersection_sizes)[:-1])
+            intersections = [intersection for intersection, keep
+                             in zip(intersections, is_edge) if keep]
+
+        # Edges are passed to igraph as an integer array, without boxing each
+        # node index into a Python int. Weights are converted to a list so
+        # that edge attributes remain Python ints.
+        return (node_index_pairs[is_edge],
+                intersection_sizes[is_edge].tolist(), intersections, mapping)
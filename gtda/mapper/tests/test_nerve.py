@@ -1,6 +1,8 @@
 """Testing for Nerve (Mapper graph construction)."""
 # License: GNU AGPLv3
 
+from itertools import combinations
+
 import numpy as np
 import pytest
 from hypothesis import given, settings, HealthCheck
@@ -44,6 +46,35 @@ def test_node_intersection(X):
     assert not any(disjoint_nodes)
 
 
+@settings(**hypothesis_settings)
+@pytest.mark.parametrize("min_intersection", [1, 2])
+@given(X=mapper_input)
+def test_edges_complete(X, min_intersection):
+    pipe = make_mapper_pipeline(min_intersection=min_intersection)
+    graph = pipe.fit_transform(X)
+
+    # Check that the elements of each node are sorted and unique
+    node_elements = graph.vs["node_elements"]
+    assert all(np.all(np.diff(elements) > 0) for elements in node_elements)
+
+    # Check that the edges are exactly the pairs of nodes from different
+    # pullback sets whose intersection is large enough, in lexicographic order
+    pullback_set_labels = graph.vs["pullback_set_label"]
+    expected_edges = []
+    expected_weights = []
+    for node_1, node_2 in combinations(range(graph.vcount()), 2):
+        if pullback_set_labels[node_1] == pullback_set_labels[node_2]:
+            continue
+        intersection_size = len(np.intersect1d(node_elements[node_1],
+                                               node_elements[node_2]))
+        if intersection_size >= min_intersection:
+            expected_edges.append((node_1, node_2))
+            expected_weights.append(intersection_size)
+
+    assert graph.get_edgelist() == expected_edges
+    assert graph.es["weight"] == expected_weights
+
+
 @settings(**hypothesis_settings)
 @given(X=mapper_input)
 def test_edge_elements(X):
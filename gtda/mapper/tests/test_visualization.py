@@ -1,6 +1,8 @@
 """Testing for Mapper plotting functions."""
 # License: GNU AGPLv3
 
+from dataclasses import dataclass
+
 from packaging.version import parse
 
 from unittest import TestCase
@@ -269,6 +271,37 @@ def test_colors_same_2d_3d(X, color_data, node_color_statistic):
                           fig_3d.data[1].marker.color)
 
 
+@dataclass
+class UnhashableMedian:
+    """Callable with ``__eq__`` but no ``__hash__``, as for default
+    dataclasses."""
+
+    def __call__(self, x):
+        return np.median(x)
+
+
+@pytest.mark.parametrize("dtype", [np.int64, np.float32, np.float64])
+@pytest.mark.parametrize("node_color_statistic",
+                         [np.mean, np.max, np.min, np.median,
+                          UnhashableMedian()])
+def test_node_color_statistic_values(dtype, node_color_statistic):
+    color_data = (10 * X_arr).astype(dtype)
+    pipe = make_mapper_pipeline()
+    graph = pipe.fit_transform(X_arr)
+    fig = plot_static_mapper_graph(pipe, X_arr, color_data=color_data,
+                                   node_color_statistic=node_color_statistic)
+
+    node_colors = np.array([[node_color_statistic(color_data[elements, j])
+                             for j in range(color_data.shape[1])]
+                            for elements in graph.vs["node_elements"]])
+    assert np.allclose(fig.data[1].marker.color, node_colors[:, 0])
+    assert np.asarray(fig.data[1].marker.color).dtype == node_colors.dtype
+    buttons = fig.layout.updatemenus[0].buttons
+    for j, button in enumerate(buttons):
+        assert np.allclose(button.args[0]["marker.color"][1],
+                           node_colors[:, j])
+
+
 @pytest.mark.parametrize("X, columns", [(X_arr, range(X_arr.shape[1])),
                                         (X_df, X_df.columns)])
 @pytest.mark.parametrize("layout_dim", [2, 3])
@@ -2,8 +2,7 @@
 # License: GNU AGPLv3
 
 from copy import deepcopy
-from functools import reduce, partial
-from operator import iconcat
+from itertools import chain
 from warnings import warn
 
 import numpy as np
@@ -72,23 +71,48 @@ PLOT_OPTIONS_LAYOUT_DEFAULTS = {
     }
 
 
+def _copy_plot_options(plot_options):
+    """Copy a dictionary of plot options whose values are either immutable or
+    dictionaries of the same kind, as are the defaults in this module."""
+    return {key: _copy_plot_options(value) if isinstance(value, dict)
+            else value
+            for key, value in plot_options.items()}
+
+
 def _set_node_sizeref(node_sizes, node_scale=12):
     # Formula from Plotly https://plot.ly/python/bubble-charts/
-    return 2. * max(node_sizes) / (node_scale ** 2)
+    return 2. * np.max(node_sizes) / (node_scale ** 2)
 
 
 def _round_to_n_sig_figs(x, n=3):
-    """Round a number x to n significant figures."""
+    """Round each entry of a 1D array x to n significant figures, and return
+    the result as a list. Zero entries are returned as the integer 0."""
+    x = np.asarray(x)
     if n is None:
-        return x
-    if not x:
-        return 0
-    return np.round(x, -int(np.floor(np.log10(np.abs(x)))) + (n - 1))
+        return x.tolist()
+
+    # Entries sharing the same number of decimals are rounded together
+    x_rounded = x.copy()
+    is_finite_nonzero = np.isfinite(x) & (x != 0)
+    decimals = np.zeros(len(x), dtype=int)
+    decimals[is_finite_nonzero] = (n - 1) - np.floor(
+        np.log10(np.abs(x[is_finite_nonzero]))
+        ).astype(int)
+    for decimal in np.unique(decimals[is_finite_nonzero]):
+        to_round = is_finite_nonzero & (decimals == decimal)
+        x_rounded[to_round] = np.round(x[to_round], decimal)
+
+    x_rounded = x_rounded.tolist()
+    for i in np.flatnonzero(x == 0):
+        x_rounded[i] = 0
+
+    return x_rounded
 
 
 def _get_node_size(node_elements):
     # TODO: Add doc strings to all functions
-    return list(map(len, node_elements))
+    return np.fromiter(map(len, node_elements), dtype=np.int64,
+                       count=len(node_elements))
 
 
 def _get_node_text(
@@ -108,11 +132,41 @@ def _get_node_text(
 
 def _get_node_statistics(color_data_transformed, node_elements,
                          node_color_statistic):
-    n_columns = color_data_transformed.shape[1]
+    # Gather the values of all nodes at once, column by column. The values of
+    # each node then form a contiguous segment, from `starts` to `stops`.
+    node_sizes = np.fromiter(map(len, node_elements), dtype=np.int64,
+                             count=len(node_elements))
+    stops = np.cumsum(node_sizes)
+    starts = stops - node_sizes
+    indices = np.concatenate(node_elements)
+    node_data = [column.take(indices) for column in color_data_transformed.T]
+
+    # Common statistics are computed on all segments with a single ufunc call
+    # per column
+    if color_data_transformed.dtype.kind in "iuf":
+        if node_color_statistic is np.mean:
+            # Sums are accumulated in float64, and the means are cast back to
+            # the dtype np.mean would return
+            mean_dtype = color_data_transformed.dtype \
+                if color_data_transformed.dtype.kind == "f" else np.float64
+            return (np.column_stack([
+                np.add.reduceat(column, starts, dtype=np.float64)
+                for column in node_data
+                ]) / node_sizes[:, None]).astype(mean_dtype, copy=False)
+        if node_color_statistic is np.max or node_color_statistic is np.amax:
+            reduction_ufunc = np.maximum
+        elif node_color_statistic is np.min or \
+                node_color_statistic is np.amin:
+            reduction_ufunc = np.minimum
+        else:
+            reduction_ufunc = None
+        if reduction_ufunc is not None:
+            return np.column_stack([reduction_ufunc.reduceat(column, starts)
+                                    for column in node_data])
 
-    return np.array([[node_color_statistic(color_data_transformed[itr, i])
-                      for i in range(n_columns)]
-                     for itr in node_elements])
+    return np.array([[node_color_statistic(column[start:stop])
+                      for column in node_data]
+                     for start, stop in zip(starts, stops)])
 
 
 def _get_column_color_buttons(
@@ -122,11 +176,12 @@ def _get_column_color_buttons(
     # TODO: Consider opting for just-in-time computation instead of computing
     # all node summary values ahead of time. Solution should preserve scroll
     # zoom functionality of 2D static visualisation.
-    def replace_summary_statistic(current_hovertext, new_statistic):
-        pos = current_hovertext.rfind(" ")
-        new_hovertext = current_hovertext[:pos] + \
-            f" {_round_to_n_sig_figs(new_statistic, n=n_sig_figs)}"
-        return new_hovertext
+    # The summary statistic is the last field of each hovertext. Everything
+    # before it is common to all columns, so it is extracted only once.
+    hovertext_prefixes = [
+        current_hovertext[:current_hovertext.rfind(" ") + 1]
+        for current_hovertext in hovertext_color_features
+        ]
 
     column_color_buttons = [
         {
@@ -141,8 +196,12 @@ def _get_column_color_buttons(
 
     for column in range(1, len(column_names_dropdown)):
         node_colors = node_colors_color_features[:, column]
-        hovertext = list(map(replace_summary_statistic,
-                             hovertext_color_features, node_colors))
+        hovertext = [
+            f"{hovertext_prefix}{new_statistic}"
+            for hovertext_prefix, new_statistic
+            in zip(hovertext_prefixes,
+                   _round_to_n_sig_figs(node_colors, n=n_sig_figs))
+            ]
 
         new_button = {
             "args": [{
@@ -299,8 +358,8 @@ def _calculate_graph_data(
 
     # Load defaults for node and edge traces
     plot_options = {
-        "node_trace": deepcopy(PLOT_OPTIONS_NODE_TRACE_DEFAULTS),
-        "edge_trace": deepcopy(PLOT_OPTIONS_EDGE_TRACE_DEFAULTS)
+        "node_trace": _copy_plot_options(PLOT_OPTIONS_NODE_TRACE_DEFAULTS),
+        "edge_trace": _copy_plot_options(PLOT_OPTIONS_EDGE_TRACE_DEFAULTS)
         }
 
     # Update size and color of nodes with zeroth column of
@@ -312,16 +371,17 @@ def _calculate_graph_data(
         "color": node_colors_color_features[:, 0]
         })
 
-    # Generate hovertext
+    # Generate hovertext. Formatting Python scalars is faster than formatting
+    # NumPy ones, hence the conversions with `tolist`.
     node_ids = graph.vs.indices
     pullback_set_ids = graph.vs["pullback_set_label"]
-    partial_cluster_labels = graph.vs["partial_cluster_label"]
-    num_node_elements = map(len, node_elements)
-    node_colors_round = map(partial(_round_to_n_sig_figs, n=n_sig_figs),
-                            node_colors_color_features[:, 0])
+    partial_cluster_labels = \
+        np.asarray(graph.vs["partial_cluster_label"]).tolist()
+    node_colors_round = _round_to_n_sig_figs(node_colors_color_features[:, 0],
+                                             n=n_sig_figs)
     plot_options["node_trace"]["hovertext"] = _get_node_text(
         node_ids, pullback_set_ids, partial_cluster_labels,
-        num_node_elements, node_colors_round
+        node_sizes.tolist(), node_colors_round
         )
 
     # Compute graph layout
@@ -331,25 +391,13 @@ def _calculate_graph_data(
             )
     node_pos = np.asarray(graph.layout(layout, dim=layout_dim).coords)
 
-    # Store x and y coordinates of edge endpoints
-    edge_x = list(
-        reduce(
-            iconcat, map(
-                lambda e: [node_pos[e.source, 0], node_pos[e.target, 0],
-                           None],
-                graph.es
-                ), []
-            )
-        )
-    edge_y = list(
-        reduce(
-            iconcat, map(
-                lambda e: [node_pos[e.source, 1], node_pos[e.target, 1],
-                           None],
-                graph.es
-                ), []
-            )
-        )
+    # Store coordinates of edge endpoints, gathered for all edges at once. Each
+    # edge is followed by a None entry so that plotly draws separate segments.
+    edges = np.fromiter(chain.from_iterable(graph.get_edgelist()), dtype=int,
+                        count=2 * graph.ecount()).reshape(-1, 2)
+    edge_pos = np.empty((len(edges), 3, layout_dim), dtype=object)
+    edge_pos[:, :2] = node_pos[edges]
+    edge_coords = edge_pos.reshape(-1, layout_dim).T.tolist()
 
     if layout_dim == 2:
         node_trace = go.Scatter(
@@ -357,7 +405,7 @@ def _calculate_graph_data(
             )
 
         edge_trace = go.Scatter(
-            x=edge_x, y=edge_y, **plot_options["edge_trace"]
+            x=edge_coords[0], y=edge_coords[1], **plot_options["edge_trace"]
             )
 
     else:
@@ -366,17 +414,9 @@ def _calculate_graph_data(
             **plot_options["node_trace"]
             )
 
-        edge_z = list(
-            reduce(
-                iconcat, map(
-                    lambda e: [node_pos[e.source][2], node_pos[e.target][2],
-                               None],
-                    graph.es
-                    ), []
-                )
-            )
         edge_trace = go.Scatter3d(
-            x=edge_x, y=edge_y, z=edge_z, **plot_options["edge_trace"]
+            x=edge_coords[0], y=edge_coords[1], z=edge_coords[2],
+            **plot_options["edge_trace"]
             )
 
     return edge_trace, node_trace, node_colors_color_features
@@ -6,6 +6,7 @@ from numbers import Integral
 import numpy as np
 import pytest
 from sklearn.exceptions import DataDimensionalityWarning
+from sklearn.utils.validation import check_array
 
 from gtda.utils import check_collection, check_point_clouds, check_diagrams, \
     validate_params
@@ -79,6 +80,25 @@ def test_validate_params_tuple_of_types():
         validate_params(parameters, references)
 
 
+def test_validate_params_ndarray():
+    references = {
+        'center': {'type': np.ndarray,
+                   'of': {'type': Integral,
+                          'in': Interval(0, np.inf, closed='left')}}
+        }
+    parameters = {'center': np.array([0, 2])}
+
+    validate_params(parameters, references)
+
+    parameters['center'] = np.array([1., 2.])
+    with pytest.raises(TypeError):
+        validate_params(parameters, references)
+
+    parameters['center'] = np.array([1, -2])
+    with pytest.raises(ValueError, match=r"`center\[1\]` is -2"):
+        validate_params(parameters, references)
+
+
 @pytest.mark.parametrize("bad_dim", [-1, 0.2])
 def test_check_diagrams_invalid_homology_dimensions(bad_dim):
     X = np.array([[[1, 1, 0], [2, 2, bad_dim]]])
@@ -121,6 +141,17 @@ def test_check_diagrams_points_below_diagonal():
         check_diagrams(X)
 
 
+def test_check_diagrams_force_all_finite():
+    X = np.array([[[0, np.inf, 0], [1, 2, 1]]])
+    check_diagrams(X)
+
+    with pytest.raises(ValueError, match="contains infinity"):
+        check_diagrams(X, force_all_finite=True)
+
+    X = np.array([[[0, 1, np.inf], [1, 2, np.inf]]])
+    check_diagrams(X, force_all_finite=True)
+
+
 # Testing check_point_clouds
 # Create several kinds of inputs
 class CreateInputs:
@@ -318,6 +349,37 @@ def test_check_point_clouds_value_err_nan(force_all_finite):
             ex.X_list_rectang, force_all_finite=force_all_finite)
 
 
+def test_check_point_clouds_same_shape_list_error_per_entry():
+    """Errors in lists of arrays of the same shape are reported per entry."""
+    X = [np.ones((3, 2)), np.array([[1., np.nan], [1., 1.], [1., 1.]])]
+
+    with pytest.raises(ValueError, match="Entry 1:\nInput contains NaN"):
+        check_point_clouds(X)
+
+
+def test_check_point_clouds_same_shape_list_ensure_min_samples():
+    """ensure_min_samples applies to each entry, not to the whole list."""
+    X = [np.ones((2, 3)) for _ in range(5)]
+
+    with pytest.raises(ValueError, match="Entry 0:\n.*minimum of 3"):
+        check_point_clouds(X, ensure_min_samples=3)
+
+
+@pytest.mark.parametrize("dtypes", [(np.float32, np.float32),
+                                    (np.int64, np.float32),
+                                    (np.int64, np.int64)])
+def test_check_point_clouds_same_shape_list_output(dtypes):
+    """Lists of arrays of the same shape give the stack of the entries checked
+    one by one."""
+    X = [np.arange(6).reshape(3, 2).astype(dtype) for dtype in dtypes]
+    X_expected = np.stack([check_array(x) for x in X])
+    X_checked = check_point_clouds(X)
+
+    assert X_checked.dtype == X_expected.dtype
+    assert X_checked.shape == X_expected.shape
+    assert np.array_equal(X_checked, X_expected)
+
+
 def test_check_collection_ragged_array():
     X = np.array([np.arange(2), np.arange(3)], dtype=object)
     with pytest.raises(ValueError):
@@ -1,8 +1,6 @@
 """Utilities for input validation."""
 # License: GNU AGPLv3
 
-from functools import reduce
-from operator import and_
 from warnings import warn
 
 import numpy as np
@@ -10,6 +8,8 @@ from scipy.sparse import issparse
 from sklearn.exceptions import DataDimensionalityWarning
 from sklearn.utils.validation import check_array
 
+from .intervals import Interval
+
 
 def _check_array_mod(X, **kwargs):
     """Modified version of :func:`sklearn.utils.validation.check_array. When
@@ -25,7 +25,7 @@ def _check_array_mod(X, **kwargs):
     return check_array(X, **kwargs)
 
 
-def check_diagrams(X, copy=False):
+def check_diagrams(X, copy=False, force_all_finite=False):
     """Input validation for collections of persistence diagrams.
 
     Basic type and sanity checks are run on the input collection and the
@@ -41,6 +41,10 @@ def check_diagrams(X, copy=False):
     copy : bool, optional, default: ``False``
         Whether a forced copy should be triggered.
 
+    force_all_finite : bool, optional, default: ``False``
+        Whether to raise an error on infinite birth or death values. Infinite
+        homology dimensions are allowed in any case.
+
     Returns
     -------
     X_validated : ndarray of shape (n_samples, n_points, 3)
@@ -53,31 +57,41 @@ def check_diagrams(X, copy=False):
         raise ValueError(
             f"Input should be a 3D ndarray, the shape is {X_array.shape}."
             )
-    if X_array.shape[2] != 3:
+    n_components = X_array.shape[2]
+    if n_components != 3:
         raise ValueError(
             f"Input should be a 3D ndarray with a 3rd dimension of 3 "
-            f"components, but there are {X_array.shape[2]} components."
+            f"components, but there are {n_components} components."
             )
 
-    homology_dimensions = sorted(np.unique(X_array[0, :, 2]))
-    for dim in homology_dimensions:
-        if dim == np.inf:
-            if len(homology_dimensions) != 1:
-                raise ValueError(
-                    f"numpy.inf is a valid homology dimension for a stacked "
-                    f"diagram but it should be the only one: "
-                    f"homology_dimensions = {homology_dimensions}."
-                    )
-        else:
-            if (dim != int(dim)) or (dim < 0):
-                raise ValueError(
-                    f"Homology dimensions should be positive integers or "
-                    f"numpy.inf: {dim} can't be cast to an int of the same "
-                    f"value."
-                    )
+    if force_all_finite and not np.isfinite(X_array[:, :, :2]).all():
+        raise ValueError(
+            "Input contains infinity in the birth or death values, which is "
+            "not allowed when parameter `force_all_finite` is True."
+            )
+
+    # np.unique returns the homology dimensions sorted, without leaving NumPy
+    homology_dimensions = np.unique(X_array[0, :, 2])
+    is_inf = homology_dimensions == np.inf
+    if is_inf.any() and len(homology_dimensions) != 1:
+        raise ValueError(
+            f"numpy.inf is a valid homology dimension for a stacked diagram "
+            f"but it should be the only one: homology_dimensions = "
+            f"{homology_dimensions.tolist()}."
+            )
+    finite_dims = homology_dimensions[~is_inf]
+    is_invalid = (finite_dims != np.floor(finite_dims)) | (finite_dims < 0)
+    if is_invalid.any():
+        raise ValueError(
+            f"Homology dimensions should be positive integers or numpy.inf: "
+            f"{finite_dims[is_invalid][0]} can't be cast to an int of the "
+            f"same value."
+            )
 
-    n_points_below_diag = np.sum(X_array[:, :, 1] < X_array[:, :, 0])
-    if n_points_below_diag:
+    # Points below the diagonal are only counted when there are some
+    if not np.all(X_array[:, :, 1] >= X_array[:, :, 0]):
+        n_points_below_diag = \
+            np.count_nonzero(X_array[:, :, 1] < X_array[:, :, 0])
         raise ValueError(
             f"All points of all persistence diagrams should be above the "
             f"diagonal, i.e. X[:, :, 1] >= X[:, :, 0]. {n_points_below_diag} "
@@ -92,50 +106,84 @@ def check_graph(X):
     return X
 
 
-def _validate_params(parameters, references, rec_name=None):
-    types_tuple = (list, tuple, np.ndarray, dict)
-
-    def _validate_params_single(_parameter, _reference, _name):
-        if _reference is None:
-            return
-
-        _ref_type = _reference.get('type', None)
-
-        # Check that _parameter has the correct type
-        if not ((_ref_type is None) or isinstance(_parameter, _ref_type)):
-            raise TypeError(f"Parameter `{_name}` is of type "
-                            f"{type(_parameter)} while it should be of type "
-                            f"{_ref_type}.")
-
-        # If neither the reference type is list, tuple, np.ndarray or dict,
-        # nor _parameter is an instance of one of these types, the checks are
-        # performed on _parameter directly.
-        elif not ((_ref_type in types_tuple)
-                  or isinstance(_parameter, types_tuple)):
-            ref_in = _reference.get('in', None)
-            ref_other = _reference.get('other', None)
-            if _parameter is not None:
-                if not ((ref_in is None) or _parameter in ref_in):
-                    raise ValueError(f"Parameter `{_name}` is {_parameter}, "
-                                     f"which is not in {ref_in}.")
-            # Perform any other checks via the callable ref_others
-            if ref_other is not None:
-                return ref_other(_parameter)
-
-        # Explicitly return the type of _reference if one of list, tuple,
-        # np.ndarray or dict.
-        else:
-            return _ref_type
+_CONTAINER_TYPES = (list, tuple, np.ndarray, dict)
+
+
+def _validate_params_single(_parameter, _name, ref_type, ref_in, ref_other):
+    """Check a single parameter against the ``'type'``, ``'in'`` and
+    ``'other'`` entries of its reference (see :func:`validate_params`)."""
+    # Check that _parameter has the correct type
+    if not ((ref_type is None) or isinstance(_parameter, ref_type)):
+        raise TypeError(f"Parameter `{_name}` is of type "
+                        f"{type(_parameter)} while it should be of type "
+                        f"{ref_type}.")
+
+    # If neither the reference type is list, tuple, np.ndarray or dict, nor
+    # _parameter is an instance of one of these types, the checks are
+    # performed on _parameter directly.
+    elif not ((ref_type in _CONTAINER_TYPES)
+              or isinstance(_parameter, _CONTAINER_TYPES)):
+        if _parameter is not None:
+            if not ((ref_in is None) or _parameter in ref_in):
+                raise ValueError(f"Parameter `{_name}` is {_parameter}, "
+                                 f"which is not in {ref_in}.")
+        # Perform any other checks via the callable ref_others
+        if ref_other is not None:
+            return ref_other(_parameter)
+
+    # Explicitly return the type of _reference if one of list, tuple,
+    # np.ndarray or dict.
+    else:
+        return ref_type
+
+
+def _validate_params_array(parameter, ref_of, name):
+    """Check all entries of a 1D numeric ndarray against `ref_of` with
+    vectorized operations. Return ``False``, without performing any check,
+    if `ref_of` requires checks which cannot be vectorized."""
+    ref_in = ref_of.get('in', None)
+    if not (parameter.ndim == 1 and parameter.dtype.kind in "biuf"
+            and ref_of.get('other', None) is None
+            and (ref_in is None or isinstance(ref_in, Interval))):
+        return False
+    if not len(parameter):
+        return True
+
+    # All entries are instances of the same scalar type
+    ref_type = ref_of.get('type', None)
+    if not ((ref_type is None) or isinstance(parameter[0], ref_type)):
+        raise TypeError(f"Parameter `{name}[0]` is of type "
+                        f"{type(parameter[0])} while it should be of type "
+                        f"{ref_type}.")
+
+    if ref_in is not None:
+        # Interval.__contains__ broadcasts over arrays
+        is_not_in = ~ref_in.__contains__(parameter)
+        if is_not_in.any():
+            i = np.flatnonzero(is_not_in)[0]
+            raise ValueError(f"Parameter `{name}[{i}]` is {parameter[i]}, "
+                             f"which is not in {ref_in}.")
+
+    return True
+
 
+def _validate_params(parameters, references, rec_name=None):
     for name, parameter in parameters.items():
-        if name not in references.keys():
+        try:
+            reference = references[name]
+        except KeyError:
             name_extras = "" if rec_name is None else f" in `{rec_name}`"
             raise KeyError(f"`{name}`{name_extras} is not an available "
                            f"parameter. Available parameters are in "
-                           f"{tuple(references.keys())}.")
+                           f"{tuple(references.keys())}.") from None
+
+        if reference is None:
+            continue
 
-        reference = references[name]
-        ref_type = _validate_params_single(parameter, reference, name)
+        ref_type = _validate_params_single(
+            parameter, name, reference.get('type', None),
+            reference.get('in', None), reference.get('other', None)
+            )
         if ref_type:
             ref_of = reference.get('of', None)
             if ref_of is None:
@@ -143,10 +191,18 @@ def _validate_params(parameters, references, rec_name=None):
                 continue
             elif ref_type == dict:
                 _validate_params(parameter, ref_of, rec_name=name)
+            elif (isinstance(parameter, np.ndarray)
+                  and _validate_params_array(parameter, ref_of, name)):
+                continue
             else:  # List, tuple or ndarray type
+                # ref_of is unpacked once for all elements
+                ref_of_type = ref_of.get('type', None)
+                ref_of_in = ref_of.get('in', None)
+                ref_of_other = ref_of.get('other', None)
                 for i, parameter_elem in enumerate(parameter):
-                    _validate_params_single(parameter_elem, ref_of,
-                                            f"{name}[{i}]")
+                    _validate_params_single(parameter_elem, f"{name}[{i}]",
+                                            ref_of_type, ref_of_in,
+                                            ref_of_other)
 
 
 def validate_params(parameters, references, exclude=None):
@@ -202,13 +258,39 @@ def validate_params(parameters, references, exclude=None):
     return _validate_params(parameters_, references)
 
 
+def _check_stacked_point_clouds(X, distance_matrices, **kwargs):
+    """Validate a list of dense 2D arrays of the same shape with a single call
+    to :func:`sklearn.utils.validation.check_array` on their stack. Return
+    ``None`` if the entries cannot be stacked or if this validation fails, so
+    that they can be validated, and errors reported, one by one."""
+    ref_dim = getattr(X[0], 'shape', None)
+    if ref_dim is None or len(ref_dim) != 2 or not all(ref_dim):
+        return None
+    if distance_matrices and ref_dim[0] != ref_dim[1]:
+        return None
+    # Minimum sizes would be checked on the stack, not on each entry
+    if 'ensure_min_samples' in kwargs or 'ensure_min_features' in kwargs:
+        return None
+    if not all(isinstance(x, np.ndarray) and x.shape == ref_dim for x in X):
+        return None
+
+    try:
+        return _check_array_mod(np.stack(X), allow_nd=True, **kwargs)
+    except ValueError:
+        return None
+
+
 def check_point_clouds(X, distance_matrices=False, **kwargs):
     """Input validation on arrays or lists representing collections of point
     clouds or of distance/adjacency matrices.
 
     The input is checked to be either a single 3D array using a single call
-    to :func:`sklearn.utils.validation.check_array`, or a list of 2D arrays by
-    calling :func:`sklearn.utils.validation.check_array` on each entry.
+    to :func:`sklearn.utils.validation.check_array`, or a list of 2D arrays.
+    A list of dense 2D arrays of the same shape is validated by a single call
+    to :func:`sklearn.utils.validation.check_array` on their stack. Other
+    lists, and lists for which this call fails, are validated by calling
+    :func:`sklearn.utils.validation.check_array` on each entry, so that
+    errors are reported per entry.
 
     Parameters
     ----------
@@ -270,30 +352,31 @@ def check_point_clouds(X, distance_matrices=False, **kwargs):
                 )
         Xnew = _check_array_mod(X, allow_nd=True, **kwargs_)
     else:
-        has_check_failed = False
-        messages = []
-        Xnew = []
-        for i, x in enumerate(X):
-            try:
-                xnew = _check_array_mod(x, ensure_2d=True, **kwargs_)
-                if distance_matrices and not issparse(xnew):
-                    if not x.shape[0] == x.shape[1]:
-                        raise ValueError(
-                            f"All arrays must be square: {x.shape[0]} rows "
-                            f"and {x.shape[1]} columns found in this array."
-                            )
-                Xnew.append(xnew)
-            except ValueError as e:
-                has_check_failed = True
-                messages.append(f"Entry {i}:\n{e}")
-        if has_check_failed:
-            raise ValueError(
-                "The following errors were raised by the inputs:\n\n" +
-                "\n\n".join(messages)
-                )
+        Xnew = _check_stacked_point_clouds(X, distance_matrices, **kwargs_)
+        if Xnew is None:
+            messages = []
+            Xnew = []
+            for i, x in enumerate(X):
+                try:
+                    xnew = _check_array_mod(x, ensure_2d=True, **kwargs_)
+                    if distance_matrices and not issparse(xnew):
+                        if not x.shape[0] == x.shape[1]:
+                            raise ValueError(
+                                f"All arrays must be square: {x.shape[0]} "
+                                f"rows and {x.shape[1]} columns found in this "
+                                f"array."
+                                )
+                    Xnew.append(xnew)
+                except ValueError as e:
+                    messages.append(f"Entry {i}:\n{e}")
+            if messages:
+                raise ValueError(
+                    "The following errors were raised by the inputs:\n\n" +
+                    "\n\n".join(messages)
+                    )
 
         if not distance_matrices:
-            if reduce(and_, (x.shape[0] == x.shape[1] for x in X), True):
+            if all(x.shape[0] == x.shape[1] for x in X):
                 warn(
                     "All arrays/matrices are square. This is consistent with "
                     "a collection of distance/adjacency matrices, but the "
@@ -303,7 +386,7 @@ def check_point_clouds(X, distance_matrices=False, **kwargs):
                     )
 
         ref_dim = X[0].shape  # Shape of first sample
-        if reduce(and_, (x.shape == ref_dim for x in X[1:]), True):
+        if all(x.shape == ref_dim for x in X):
             Xnew = np.asarray(Xnew)
 
     return Xnew
@@ -335,7 +418,6 @@ def check_collection(X, **kwargs):
     if hasattr(X, 'shape') and hasattr(X, 'ndim'):
         Xnew = _check_array_mod(X, ensure_2d=True, allow_nd=True, **kwargs_)
     else:
-        has_check_failed = False
         messages = []
         Xnew = []
         for i, x in enumerate(X):
@@ -344,9 +426,8 @@ def check_collection(X, **kwargs):
                                         **kwargs_)
                 Xnew.append(xnew)
             except ValueError as e:
-                has_check_failed = True
                 messages.append(f"Entry {i}:\n{e}")
-        if has_check_failed:
+        if messages:
             raise ValueError(
                 "The following errors were raised by the inputs:\n\n" +
                 "\n\n".join(messages)